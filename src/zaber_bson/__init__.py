@@ -19,11 +19,11 @@ over-engineered:
 For binaries, only the default 0x0 type is supported.
 """
 
-from typing import Any
+from typing import Any, Container, Optional
 
 from .codec import *
 
-__all__ = ["loads", "dumps"]
+__all__ = ["loads", "loads_lazy", "dumps"]
 
 
 def dumps(obj: Any, generator: GeneratorFunc=None, on_unknown: OnUnknown=None) -> bytes:
@@ -41,8 +41,28 @@ def dumps(obj: Any, generator: GeneratorFunc=None, on_unknown: OnUnknown=None) -
                            generator_func=generator, on_unknown=on_unknown)
 
 
-def loads(data: bytes) -> Any:
+def loads(data: bytes, projection: Optional[Container[Key]]=None, zero_copy: bool=False) -> Any:
     """
         Given a BSON string, outputs a dict.
+
+        projection is an optional collection of top-level keys to decode; all
+        other top-level elements are skipped without being decoded. Objects
+        encoded from BSONCoding classes are only rebuilt if their class name
+        key is part of the projection.
+
+        If zero_copy is set, binary values are returned as memoryview slices
+        of data rather than as bytes copies. The views are read-only, but they
+        share data's memory: each one keeps the whole of data alive for as
+        long as it is referenced, and a bytearray cannot be resized while any
+        of them exist. Changes made to a bytearray show through the views.
+        UUIDs are still decoded as UUIDs.
+    """
+    return decode_document(data, 0, projection=projection, zero_copy=zero_copy)[1]
+
+
+def loads_lazy(data: bytes) -> LazyBSONDocument:
+    """
+        Given a BSON string, outputs a read-only mapping which decodes values
+        only when they are looked up.
     """
-    return decode_document(data, 0)[1]
+    return LazyBSONDocument(data)
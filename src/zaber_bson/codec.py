@@ -6,16 +6,18 @@
 """
 Base codec functions for bson.
 """
+import os
 import struct
+import sys
 import warnings
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from abc import ABCMeta, abstractmethod
 from uuid import UUID
 from decimal import Decimal
-from io import BytesIO as StringIO
-import calendar
 from binascii import b2a_hex
-from typing import Optional, Union, Callable, List, Iterator, Any, Tuple, Dict
+from itertools import islice
+from types import FrameType
+from typing import Optional, Union, Callable, List, Iterator, Any, Tuple, Dict, Mapping, Container
 
 from zaber_bson.types import UInt64, Int64, Int32
 
@@ -24,6 +26,19 @@ AnyDict = Dict[Key, Any]
 AnyList = List[Any]
 AnyTuple = Tuple[Any, ...]
 
+_UNPACK_DOUBLE = struct.Struct("<d").unpack_from
+_UNPACK_I32 = struct.Struct("<i").unpack_from
+_UNPACK_I64 = struct.Struct("<q").unpack_from
+_UNPACK_U64 = struct.Struct("<Q").unpack_from
+_UNPACK_IB = struct.Struct("<ib").unpack_from
+
+_PACK_DOUBLE = struct.Struct("<d").pack
+_PACK_I32 = struct.Struct("<i").pack
+_PACK_I32_INTO = struct.Struct("<i").pack_into
+_PACK_I64 = struct.Struct("<q").pack
+_PACK_U64 = struct.Struct("<Q").pack
+_PACK_IB = struct.Struct("<ib").pack
+
 
 class MissingClassDefinition(ValueError):
     def __init__(self, class_name: str):
@@ -91,18 +106,56 @@ def import_classes_from_modules(*args: Any) -> None:
 
 def encode_object(obj: BSONCoding, traversal_stack: TraversalStack,
                   generator_func: GeneratorFunc, on_unknown: OnUnknown=None) -> bytes:
+    buf = bytearray()
+    encode_object_into(buf, obj, traversal_stack, generator_func, on_unknown)
+    return bytes(buf)
+
+
+def encode_object_into(buf: bytearray, obj: BSONCoding, traversal_stack: TraversalStack,
+                       generator_func: GeneratorFunc, on_unknown: OnUnknown=None) -> None:
     values = obj.bson_encode()
-    class_name = obj.__class__.__name__
-    values[CLASSNAME_KEY] = class_name
-    return encode_document(values, traversal_stack, obj,
-                           generator_func, on_unknown)
+    if generator_func is not None or CLASSNAME_KEY in values:
+        # The generator has to see the class name among the keys. Copy rather
+        # than add it to the dict bson_encode returned, it may well be the
+        # object's own state.
+        copied = {name: values[name] for name in values.keys()}
+        copied[CLASSNAME_KEY] = type(obj).__name__
+        encode_document_into(buf, copied, traversal_stack, obj,
+                             generator_func=generator_func, on_unknown=on_unknown)
+        return
+
+    start = len(buf)
+    buf += b"\x00\x00\x00\x00"
+    for name in values.keys():
+        encode_value(name, values[name], buf, traversal_stack,
+                     None, on_unknown)
+    buf += _class_name_element(type(obj))
+    buf.append(0)
+    _PACK_I32_INTO(buf, start, len(buf) - start)
+
+
+_CLASSNAME_KEY_CSTR = CLASSNAME_KEY.encode("utf-8") + b"\x00"
+
+
+def _class_name_element(cls: type) -> bytes:
+    """
+    Returns the encoded class name element for objects of cls. It is built
+    once and stored on the class itself, looked up in the class's own
+    __dict__ so that subclasses don't pick up their parent's name.
+    """
+    element: Optional[bytes] = cls.__dict__.get("_bson_class_name_element")
+    if element is None:
+        element = b"\x02" + _CLASSNAME_KEY_CSTR + encode_string(cls.__name__)
+        setattr(cls, "_bson_class_name_element", element)
+    return element
 
 
 def encode_object_element(name: Key, value: BSONCoding, traversal_stack: TraversalStack,
                           generator_func: GeneratorFunc, on_unknown: OnUnknown) -> bytes:
-    return b"\x03" + encode_cstring(name) + \
-           encode_object(value, traversal_stack,
-                         generator_func=generator_func, on_unknown=on_unknown)
+    buf = bytearray(b"\x03")
+    buf += encode_cstring(name)
+    encode_object_into(buf, value, traversal_stack, generator_func, on_unknown)
+    return bytes(buf)
 
 
 class _EmptyClass:
@@ -126,11 +179,34 @@ def decode_object(raw_values: AnyDict) -> Any:
 
 def encode_string(value: str) -> bytes:
     bvalue = value.encode("utf-8")
-    length = len(bvalue)
-    return struct.pack(f"<i{length}sb", length + 1, bvalue, 0)
+    return _PACK_I32(len(bvalue) + 1) + bvalue + b"\x00"
+
+
+# Element names repeat heavily between documents, so the encoded form of
+# short str names is memoised. Long names are unlikely to repeat and would
+# pin large strings, so they are not cached. The cache is cleared when it
+# fills up, so documents with unbounded key sets cannot exhaust memory and a
+# workload whose names change over time still gets cached.
+_CSTRING_CACHE: Dict[str, bytes] = {}
+_CSTRING_CACHE_MAX = 4096
+_CSTRING_CACHE_MAX_NAME = 64
 
 
 def encode_cstring(value: Key) -> bytes:
+    if type(value) is str:  # pylint: disable=unidiomatic-typecheck
+        cached = _CSTRING_CACHE.get(value)
+        if cached is not None:
+            return cached
+        cstring = _encode_cstring(value)
+        if len(value) <= _CSTRING_CACHE_MAX_NAME:
+            if len(_CSTRING_CACHE) >= _CSTRING_CACHE_MAX:
+                _CSTRING_CACHE.clear()
+            _CSTRING_CACHE[value] = cstring
+        return cstring
+    return _encode_cstring(value)
+
+
+def _encode_cstring(value: Key) -> bytes:
     if not isinstance(value, bytes):
         value = str(value).encode("utf-8")
     if b"\x00" in value:
@@ -141,12 +217,11 @@ def encode_cstring(value: Key) -> bytes:
 
 
 def encode_binary(value: bytes, binary_subtype: int=0) -> bytes:
-    length = len(value)
-    return struct.pack("<ib", length, binary_subtype) + value
+    return _PACK_IB(len(value), binary_subtype) + value
 
 
 def encode_double(value: float) -> bytes:
-    return struct.pack("<d", value)
+    return _PACK_DOUBLE(value)
 
 
 ELEMENT_TYPES = {
@@ -173,86 +248,259 @@ def encode_string_element(name: Key, value: str) -> bytes:
     return b"\x02" + encode_cstring(name) + encode_string(value)
 
 
-def encode_value(name: Key, value: Any, buf: StringIO, traversal_stack: TraversalStack,
+def encode_value(name: Key, value: Any, buf: bytearray, traversal_stack: TraversalStack,
                  generator_func: GeneratorFunc, on_unknown: OnUnknown=None) -> None:
-    if isinstance(value, bool):
-        buf.write(encode_boolean_element(name, value))
+    encode_value_with_raw_name(name, encode_cstring(name), value, buf, traversal_stack,
+                               generator_func=generator_func, on_unknown=on_unknown)
+
+
+def encode_value_with_raw_name(name: Optional[Key], name_cstr: bytes, value: Any, buf: bytearray,
+                               traversal_stack: TraversalStack, *, generator_func: GeneratorFunc,
+                               on_unknown: OnUnknown=None) -> None:
+    """
+    Like encode_value, but with the element name already encoded as a cstring.
+    name is only used to report errors; if it is None, the name is recovered
+    from name_cstr instead.
+    """
+    encoder = _ENCODERS.get(type(value))
+    if encoder is not None:
+        encoder(buf, name_cstr, value)
+    # Subclasses of the types in _ENCODERS, most common first. bool and
+    # NoneType cannot be subclassed, so they never get this far. The scalar
+    # checks come before the containers and BSONCoding, so a class deriving
+    # from both, say int and BSONCoding, still encodes as its scalar type.
+    elif isinstance(value, str):
+        _write_string(buf, name_cstr, value)
     elif isinstance(value, int):
-        if value < -0x80000000 or 0x7FFFFFFFFFFFFFFF >= value > 0x7fffffff:
-            buf.write(encode_int64_element(name, value))
-        elif value > 0x7FFFFFFFFFFFFFFF:
-            if value > 0xFFFFFFFFFFFFFFFF:
-                raise ValueError(f"BSON format supports only int value < {0xFFFFFFFFFFFFFFFF}")
-            buf.write(encode_uint64_element(name, value))
-        else:
-            buf.write(encode_int32_element(name, value))
-    elif isinstance(value, Int32):
-        buf.write(encode_int32_element(name, value.get_value()))
-    elif isinstance(value, Int64):
-        buf.write(encode_int64_element(name, value.get_value()))
-    elif isinstance(value, UInt64):
-        buf.write(encode_uint64_element(name, value.get_value()))
+        _write_int(buf, name_cstr, value)
     elif isinstance(value, float):
-        buf.write(encode_double_element(name, value))
-    elif isinstance(value, str):
-        buf.write(encode_string_element(name, value))
+        _write_double(buf, name_cstr, value)
     elif isinstance(value, bytes):
-        buf.write(encode_binary_element(name, value))
-    elif isinstance(value, UUID):
-        buf.write(encode_binary_element(name, value.bytes, binary_subtype=4))
+        _write_binary(buf, name_cstr, value)
     elif isinstance(value, datetime):
-        buf.write(encode_utc_datetime_element(name, value))
-    elif value is None:
-        buf.write(encode_none_element(name))
+        _write_utc_datetime(buf, name_cstr, value)
+    elif isinstance(value, UUID):
+        _write_uuid(buf, name_cstr, value)
+    elif isinstance(value, Int32):
+        _write_int32(buf, name_cstr, value)
+    elif isinstance(value, Int64):
+        _write_int64(buf, name_cstr, value)
+    elif isinstance(value, UInt64):
+        _write_uint64(buf, name_cstr, value)
     elif isinstance(value, dict):
-        buf.write(encode_document_element(name, value, traversal_stack,
-                                          generator_func, on_unknown))
+        buf += b"\x03"
+        buf += name_cstr
+        encode_document_into(buf, value, traversal_stack,
+                             generator_func=generator_func, on_unknown=on_unknown)
     elif isinstance(value, (list, tuple)):
-        buf.write(encode_array_element(name, value, traversal_stack,
-                                       generator_func, on_unknown))
+        buf += b"\x04"
+        buf += name_cstr
+        encode_array_into(buf, value, traversal_stack,
+                          generator_func=generator_func, on_unknown=on_unknown)
     elif isinstance(value, BSONCoding):
-        buf.write(encode_object_element(name, value, traversal_stack,
-                                        generator_func, on_unknown))
+        buf += b"\x03"
+        buf += name_cstr
+        encode_object_into(buf, value, traversal_stack,
+                           generator_func, on_unknown)
     elif isinstance(value, Decimal):
-        buf.write(encode_double_element(name, float(value)))
+        _write_decimal(buf, name_cstr, value)
     else:
         if on_unknown is not None:
-            encode_value(name, on_unknown(value), buf, traversal_stack,
-                         generator_func, on_unknown)
+            encode_value_with_raw_name(name, name_cstr, on_unknown(value), buf, traversal_stack,
+                                       generator_func=generator_func, on_unknown=on_unknown)
         else:
+            if name is None:
+                name = name_cstr[:-1].decode("utf-8")
             raise UnknownSerializerError(name, value)
 
 
+# Writers for the scalar element types. Each appends the type tag, the
+# already-encoded element name and the value to buf.
+
+def _write_boolean(buf: bytearray, name_cstr: bytes, value: bool) -> None:
+    buf += b"\x08"
+    buf += name_cstr
+    buf += b"\x01" if value else b"\x00"
+
+
+def _write_int(buf: bytearray, name_cstr: bytes, value: int) -> None:
+    if -0x80000000 <= value <= 0x7FFFFFFF:
+        buf += b"\x10"
+        buf += name_cstr
+        buf += _PACK_I32(value)
+    elif -0x8000000000000000 <= value <= 0x7FFFFFFFFFFFFFFF:
+        buf += b"\x12"
+        buf += name_cstr
+        buf += _PACK_I64(value)
+    elif 0 <= value <= 0xFFFFFFFFFFFFFFFF:
+        buf += b"\x11"
+        buf += name_cstr
+        buf += _PACK_U64(value)
+    else:
+        raise ValueError(f"BSON format supports only int values from {-0x8000000000000000} "
+                         f"to {0xFFFFFFFFFFFFFFFF}")
+
+
+def _write_int32(buf: bytearray, name_cstr: bytes, value: Int32) -> None:
+    buf += b"\x10"
+    buf += name_cstr
+    buf += _PACK_I32(value.get_value())
+
+
+def _write_int64(buf: bytearray, name_cstr: bytes, value: Int64) -> None:
+    buf += b"\x12"
+    buf += name_cstr
+    buf += _PACK_I64(value.get_value())
+
+
+def _write_uint64(buf: bytearray, name_cstr: bytes, value: UInt64) -> None:
+    buf += b"\x11"
+    buf += name_cstr
+    buf += _PACK_U64(value.get_value())
+
+
+def _write_double(buf: bytearray, name_cstr: bytes, value: float) -> None:
+    buf += b"\x01"
+    buf += name_cstr
+    buf += _PACK_DOUBLE(value)
+
+
+def _write_decimal(buf: bytearray, name_cstr: bytes, value: Decimal) -> None:
+    buf += b"\x01"
+    buf += name_cstr
+    buf += _PACK_DOUBLE(float(value))
+
+
+def _write_string(buf: bytearray, name_cstr: bytes, value: str) -> None:
+    buf += b"\x02"
+    buf += name_cstr
+    buf += encode_string(value)
+
+
+def _write_binary(buf: bytearray, name_cstr: bytes, value: bytes) -> None:
+    buf += b"\x05"
+    buf += name_cstr
+    buf += encode_binary(value)
+
+
+def _write_uuid(buf: bytearray, name_cstr: bytes, value: UUID) -> None:
+    buf += b"\x05"
+    buf += name_cstr
+    buf += encode_binary(value.bytes, binary_subtype=4)
+
+
+def _write_utc_datetime(buf: bytearray, name_cstr: bytes, value: datetime) -> None:
+    buf += b"\x09"
+    buf += name_cstr
+    buf += encode_utc_datetime(value)
+
+
+def _write_none(buf: bytearray, name_cstr: bytes, value: None) -> None:  # pylint: disable=unused-argument
+    buf += b"\x0a"
+    buf += name_cstr
+
+
+# Scalar writers keyed by exact type, so the common types are dispatched with
+# a single lookup. Subclasses fall through to the isinstance checks.
+_ENCODERS: Dict[type, Callable[[bytearray, bytes, Any], None]] = {
+    bool: _write_boolean,
+    int: _write_int,
+    Int32: _write_int32,
+    Int64: _write_int64,
+    UInt64: _write_uint64,
+    float: _write_double,
+    Decimal: _write_decimal,
+    str: _write_string,
+    bytes: _write_binary,
+    UUID: _write_uuid,
+    datetime: _write_utc_datetime,
+    type(None): _write_none,
+}
+
+
 def encode_document(obj: AnyDict, traversal_stack: TraversalStack, traversal_parent: object=None,
                     generator_func: GeneratorFunc=None, on_unknown: OnUnknown=None) -> bytes:
-    buf = StringIO()
-    key_iter = iter(obj.keys())
-    if generator_func is not None:
-        key_iter = generator_func(obj, traversal_stack)
-    for name in key_iter:
-        value = obj[name]
-        traversal_stack.append(TraversalStep(traversal_parent or obj, name))
-        encode_value(name, value, buf, traversal_stack,
-                     generator_func, on_unknown)
-        traversal_stack.pop()
-    e_list = buf.getvalue()
-    e_list_length = len(e_list)
-    return struct.pack(f"<i{e_list_length}sb",
-                       e_list_length + 4 + 1, e_list, 0)
+    buf = bytearray()
+    encode_document_into(buf, obj, traversal_stack, traversal_parent,
+                         generator_func=generator_func, on_unknown=on_unknown)
+    return bytes(buf)
+
+
+def encode_document_into(buf: bytearray, obj: AnyDict, traversal_stack: TraversalStack,
+                         traversal_parent: object=None, *, generator_func: GeneratorFunc=None,
+                         on_unknown: OnUnknown=None) -> None:
+    # Reserve the length prefix and patch it in once the elements are written.
+    start = len(buf)
+    buf += b"\x00\x00\x00\x00"
+    if generator_func is None:
+        # The traversal stack only exists to be handed to generator_func, so
+        # don't pay for maintaining it when there is nobody to read it.
+        for name in obj.keys():
+            encode_value(name, obj[name], buf, traversal_stack,
+                         None, on_unknown)
+    else:
+        for name in generator_func(obj, traversal_stack):
+            value = obj[name]
+            traversal_stack.append(TraversalStep(traversal_parent or obj, name))
+            encode_value(name, value, buf, traversal_stack,
+                         generator_func, on_unknown)
+            traversal_stack.pop()
+    buf.append(0)
+    _PACK_I32_INTO(buf, start, len(buf) - start)
+
+
+# Array elements are named by their decimal index; the names of the first
+# indices are encoded up front so encode_array_into can skip encode_cstring.
+_ARRAY_INDEX_CSTR_COUNT = 1000
+_ARRAY_INDEX_CSTR = [str(i).encode("ascii") + b"\x00" for i in range(_ARRAY_INDEX_CSTR_COUNT)]
+_ARRAY_INT32_PREFIX = [b"\x10" + cstr for cstr in _ARRAY_INDEX_CSTR]
 
 
 def encode_array(array: Union[AnyList, AnyTuple], traversal_stack: TraversalStack, traversal_parent: object=None,
                  generator_func: GeneratorFunc=None, on_unknown: OnUnknown=None) -> bytes:
-    buf = StringIO()
-    for i, value in enumerate(array):
-        traversal_stack.append(TraversalStep(traversal_parent or array, i))
-        encode_value(str(i), value, buf, traversal_stack,
-                     generator_func, on_unknown)
-        traversal_stack.pop()
-    e_list = buf.getvalue()
-    e_list_length = len(e_list)
-    return struct.pack(f"<i{e_list_length}sb",
-                       e_list_length + 4 + 1, e_list, 0)
+    buf = bytearray()
+    encode_array_into(buf, array, traversal_stack, traversal_parent,
+                      generator_func=generator_func, on_unknown=on_unknown)
+    return bytes(buf)
+
+
+def encode_array_into(buf: bytearray, array: Union[AnyList, AnyTuple], traversal_stack: TraversalStack,
+                      traversal_parent: object=None, *, generator_func: GeneratorFunc=None,
+                      on_unknown: OnUnknown=None) -> None:
+    start = len(buf)
+    buf += b"\x00\x00\x00\x00"
+
+    # Leading runs of plain int32 values, as in numeric arrays, are written by
+    # a tight loop that skips the per-element dispatch. It stops at the first
+    # other value and leaves the rest of the array to the general loop.
+    count = 0
+    for value in array:
+        if type(value) is not int or not -0x80000000 <= value <= 0x7FFFFFFF:  # pylint: disable=unidiomatic-typecheck
+            break
+        if count < _ARRAY_INDEX_CSTR_COUNT:
+            buf += _ARRAY_INT32_PREFIX[count]
+        else:
+            buf += b"\x10"
+            buf += str(count).encode("ascii")
+            buf += b"\x00"
+        buf += _PACK_I32(value)
+        count += 1
+
+    for i, value in enumerate(islice(array, count, None), count):
+        if i < _ARRAY_INDEX_CSTR_COUNT:
+            name_cstr = _ARRAY_INDEX_CSTR[i]
+        else:
+            name_cstr = str(i).encode("ascii") + b"\x00"
+        if generator_func is None:
+            encode_value_with_raw_name(None, name_cstr, value, buf, traversal_stack,
+                                       generator_func=None, on_unknown=on_unknown)
+        else:
+            traversal_stack.append(TraversalStep(traversal_parent or array, i))
+            encode_value_with_raw_name(None, name_cstr, value, buf, traversal_stack,
+                                       generator_func=generator_func, on_unknown=on_unknown)
+            traversal_stack.pop()
+    buf.append(0)
+    _PACK_I32_INTO(buf, start, len(buf) - start)
 
 
 def decode_binary_subtype(value: bytes, binary_subtype: int)-> Union[UUID, bytes]:
@@ -261,81 +509,92 @@ def decode_binary_subtype(value: bytes, binary_subtype: int)-> Union[UUID, bytes
     return value
 
 
-def decode_document(data: bytes, base: int, as_array: bool=False) -> Tuple[int, Any]:
-    # Create all the struct formats we might use.
-    double_struct = struct.Struct("<d")
-    int_struct = struct.Struct("<i")
-    char_struct = struct.Struct("<b")
-    long_struct = struct.Struct("<q")
-    uint64_struct = struct.Struct("<Q")
-    int_char_struct = struct.Struct("<ib")
+# Strings at least this long are decoded through a memoryview of the input
+# rather than from a sliced copy of it. Below this size, making the memoryview
+# costs more than the copy it saves.
+_MEMORYVIEW_DECODE_MIN = 1 << 16
 
-    length = struct.unpack("<i", data[base:base + 4])[0]
+# The decoding counterpart of _CSTRING_CACHE, with the same limits. Element
+# names that are not valid UTF-8 are kept as bytes; caching them also spares
+# the decode failure.
+_DECODED_NAME_CACHE: Dict[bytes, Key] = {}
+
+
+def _decode_name(raw_name: bytes) -> Key:
+    """
+    Decodes an element name that missed _DECODED_NAME_CACHE, and caches it.
+    Callers look the name up in the cache themselves first.
+    """
+    name: Key
+    try:
+        name = raw_name.decode("utf-8")
+    except UnicodeDecodeError:
+        name = raw_name
+    if len(raw_name) <= _CSTRING_CACHE_MAX_NAME:
+        if len(_DECODED_NAME_CACHE) >= _CSTRING_CACHE_MAX:
+            _DECODED_NAME_CACHE.clear()
+        _DECODED_NAME_CACHE[raw_name] = name
+    return name
+
+
+def decode_document(data: bytes, base: int, as_array: bool=False,
+                    projection: Optional[Container[Key]]=None, zero_copy: bool=False) -> Tuple[int, Any]:
+    """
+    Decodes the document or array starting at base.
+    If projection is given, elements whose names are not in it are skipped
+    without being decoded. It only applies to this document, not to the
+    documents nested in it.
+    If zero_copy is set, binary values other than UUIDs are returned as
+    read-only memoryview slices of data instead of bytes copies.
+    """
+    if len(data) - base < 5:
+        raise ValueError('invalid document length')
+    length = _UNPACK_I32(data, base)[0]
     end_point = base + length
-    if data[end_point - 1] not in ('\0', 0):
+    if length < 5 or end_point > len(data):
+        raise ValueError('invalid document length')
+    if data[end_point - 1] != 0:
         raise ValueError('missing null-terminator in document')
     base += 4
 
     retval: Union[AnyDict, AnyList] = [] if as_array else {}
     decode_name = not as_array
+    # Names are cached by their raw bytes, so slices of other buffer types
+    # such as bytearray have to be converted to be hashable.
+    bytes_input = isinstance(data, bytes)
     name: Optional[Key] = None
+    value: Any
 
     while base < end_point - 1:
 
-        element_type = char_struct.unpack(data[base:base + 1])[0]
+        element_type = data[base]
 
-        ll = data.index(0, base + 1) + 1
+        nul = data.index(0, base + 1)
         if decode_name:
-            name = data[base + 1:ll - 1]
-            try:
-                name = name.decode("utf-8")
-            except UnicodeDecodeError:
-                pass
+            raw_name = data[base + 1:nul]
+            if not bytes_input:
+                raw_name = bytes(raw_name)
+            name = _DECODED_NAME_CACHE.get(raw_name)
+            if name is None:
+                name = _decode_name(raw_name)
         else:
             name = None
-        base = ll
+        base = nul + 1
 
-        if element_type == 0x01:  # double
-            value = double_struct.unpack(data[base: base + 8])[0]
-            base += 8
-        elif element_type == 0x02:  # string
-            length = int_struct.unpack(data[base:base + 4])[0]
-            value = data[base + 4: base + 4 + length - 1]
-            value = value.decode("utf-8")
-            base += 4 + length
-        elif element_type == 0x03:  # document
-            base, value = decode_document(data, base)
-        elif element_type == 0x04:  # array
-            base, value = decode_document(data, base, as_array=True)
-        elif element_type == 0x05:  # binary
-            length, binary_subtype = int_char_struct.unpack(
-                data[base:base + 5])
-            value = data[base + 5:base + 5 + length]
-            value = decode_binary_subtype(value, binary_subtype)
-            base += 5 + length
-        elif element_type == 0x07:  # object_id
-            value = b2a_hex(data[base:base + 12])
-            base += 12
-        elif element_type == 0x08:  # boolean
-            value = bool(char_struct.unpack(data[base:base + 1])[0])
-            base += 1
-        elif element_type == 0x09:  # UTCdatetime
-            value = datetime.fromtimestamp(
-                long_struct.unpack(data[base:base + 8])[0] / 1000.0, tz=timezone.utc)
-            base += 8
-        elif element_type == 0x0A:  # none
-            value = None
-        elif element_type == 0x10:  # int32
-            value = int_struct.unpack(data[base:base + 4])[0]
+        if projection is not None and name not in projection:
+            base = _skip_value(data, base, element_type)
+            continue
+
+        # The two most common fixed-size types are decoded inline, which
+        # saves a call per element; everything else goes through decode_value.
+        if element_type == 0x10:  # int32
+            value = _UNPACK_I32(data, base)[0]
             base += 4
-        elif element_type == 0x11:  # uint64
-            value = uint64_struct.unpack(data[base:base + 8])[0]
-            base += 8
-        elif element_type == 0x12:  # int64
-            value = long_struct.unpack(data[base:base + 8])[0]
+        elif element_type == 0x01:  # double
+            value = _UNPACK_DOUBLE(data, base)[0]
             base += 8
         else:
-            raise ValueError(f"Unknown element type: {element_type}")
+            base, value = decode_value(data, base, element_type, zero_copy)
 
         if isinstance(retval, list):
             retval.append(value)
@@ -349,18 +608,147 @@ def decode_document(data: bytes, base: int, as_array: bool=False) -> Tuple[int,
         return end_point, retval
 
 
+def decode_value(data: bytes, base: int, element_type: int, zero_copy: bool=False) -> Tuple[int, Any]:
+    """
+    Decodes a single element value of the given type starting at base.
+    Returns the offset just past the value along with the value.
+    zero_copy is as for decode_document.
+    """
+    value: Any
+    # Branches are ordered by how common each type is in practice.
+    if element_type == 0x02:  # string
+        length = _UNPACK_I32(data, base)[0]
+        if length < _MEMORYVIEW_DECODE_MIN:
+            value = data[base + 4: base + 4 + length - 1].decode("utf-8")
+        else:
+            value = str(memoryview(data)[base + 4: base + 4 + length - 1], "utf-8")
+        base += 4 + length
+    elif element_type == 0x10:  # int32
+        value = _UNPACK_I32(data, base)[0]
+        base += 4
+    elif element_type == 0x03:  # document
+        base, value = decode_document(data, base, zero_copy=zero_copy)
+    elif element_type == 0x01:  # double
+        value = _UNPACK_DOUBLE(data, base)[0]
+        base += 8
+    elif element_type == 0x04:  # array
+        base, value = decode_document(data, base, as_array=True, zero_copy=zero_copy)
+    elif element_type == 0x08:  # boolean
+        value = data[base] != 0
+        base += 1
+    elif element_type == 0x12:  # int64
+        value = _UNPACK_I64(data, base)[0]
+        base += 8
+    elif element_type == 0x0A:  # none
+        value = None
+    elif element_type == 0x09:  # UTCdatetime
+        value = datetime.fromtimestamp(
+            _UNPACK_I64(data, base)[0] / 1000.0, tz=timezone.utc)
+        base += 8
+    elif element_type == 0x05:  # binary
+        length, binary_subtype = _UNPACK_IB(data, base)
+        if zero_copy and binary_subtype not in (0x03, 0x04):
+            value = memoryview(data)[base + 5:base + 5 + length].toreadonly()
+        else:
+            value = data[base + 5:base + 5 + length]
+            value = decode_binary_subtype(value, binary_subtype)
+        base += 5 + length
+    elif element_type == 0x11:  # uint64
+        value = _UNPACK_U64(data, base)[0]
+        base += 8
+    elif element_type == 0x07:  # object_id
+        value = b2a_hex(data[base:base + 12])
+        base += 12
+    else:
+        raise ValueError(f"Unknown element type: {element_type}")
+    return base, value
+
+
+# Sizes of the element values that have a fixed width.
+_FIXED_SIZES = {0x01: 8, 0x07: 12, 0x08: 1, 0x09: 8, 0x0A: 0, 0x10: 4, 0x11: 8, 0x12: 8}
+
+
+def _skip_value(data: bytes, base: int, element_type: int) -> int:
+    size = _FIXED_SIZES.get(element_type)
+    if size is not None:
+        return base + size
+    length: int = _UNPACK_I32(data, base)[0]
+    if element_type == 0x02:  # string
+        return base + 4 + length
+    elif element_type in (0x03, 0x04):  # document, array
+        return base + length
+    elif element_type == 0x05:  # binary
+        return base + 5 + length
+    else:
+        raise ValueError(f"Unknown element type: {element_type}")
+
+
+class LazyBSONDocument(Mapping[Key, Any]):
+    """
+    A read-only mapping over an encoded BSON document.
+
+    Construction only indexes where each element starts; a value is decoded
+    each time it is looked up, so fields that are never read are never
+    decoded. Sub-documents and arrays are decoded in full when accessed.
+    Unlike loads, a top-level document carrying a class name is not turned
+    back into a BSONCoding object.
+    """
+
+    def __init__(self, data: bytes, base: int = 0):
+        self._data = data
+        self._index: Dict[Key, Tuple[int, int]] = {}
+
+        if len(data) - base < 5:
+            raise ValueError('invalid document length')
+        length = _UNPACK_I32(data, base)[0]
+        end_point = base + length
+        if length < 5 or end_point > len(data):
+            raise ValueError('invalid document length')
+        if data[end_point - 1] != 0:
+            raise ValueError('missing null-terminator in document')
+        base += 4
+
+        while base < end_point - 1:
+            element_type = data[base]
+            nul = data.index(0, base + 1)
+            raw_name = bytes(data[base + 1:nul])
+            name = _DECODED_NAME_CACHE.get(raw_name)
+            if name is None:
+                name = _decode_name(raw_name)
+            self._index[name] = (element_type, nul + 1)
+            base = _skip_value(data, nul + 1, element_type)
+
+    def __getitem__(self, key: Key) -> Any:
+        element_type, base = self._index[key]
+        return decode_value(self._data, base, element_type)[1]
+
+    def __contains__(self, key: object) -> bool:
+        # Mapping's default would decode the value just to test for the key.
+        return key in self._index
+
+    def __iter__(self) -> Iterator[Key]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
 def encode_document_element(name: Key, value: AnyDict, traversal_stack: TraversalStack,
                             generator_func: GeneratorFunc, on_unknown: OnUnknown) -> bytes:
-    return b"\x03" + encode_cstring(name) + \
-           encode_document(value, traversal_stack,
-                           generator_func=generator_func, on_unknown=on_unknown)
+    buf = bytearray(b"\x03")
+    buf += encode_cstring(name)
+    encode_document_into(buf, value, traversal_stack,
+                         generator_func=generator_func, on_unknown=on_unknown)
+    return bytes(buf)
 
 
 def encode_array_element(name: Key, value: Union[AnyList, AnyTuple], traversal_stack: TraversalStack,
                          generator_func: GeneratorFunc, on_unknown: OnUnknown) -> bytes:
-    return b"\x04" + encode_cstring(name) + \
-           encode_array(value, traversal_stack,
-                        generator_func=generator_func, on_unknown=on_unknown)
+    buf = bytearray(b"\x04")
+    buf += encode_cstring(name)
+    encode_array_into(buf, value, traversal_stack,
+                      generator_func=generator_func, on_unknown=on_unknown)
+    return bytes(buf)
 
 
 def encode_binary_element(name: Key, value: bytes, binary_subtype: int=0) -> bytes:
@@ -368,15 +756,43 @@ def encode_binary_element(name: Key, value: bytes, binary_subtype: int=0) -> byt
 
 
 def encode_boolean_element(name: Key, value: bool) -> bytes:
-    return b"\x08" + encode_cstring(name) + struct.pack("<b", value)
+    return b"\x08" + encode_cstring(name) + (b"\x01" if value else b"\x00")
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_ONE_MILLISECOND = timedelta(milliseconds=1)
+
+
+_PACKAGE_DIR = os.path.dirname(__file__)
+
+
+def _external_stacklevel() -> int:
+    """
+    Returns the warnings stacklevel, relative to the caller of this function,
+    of the first frame outside this package. The encoders recurse, so the
+    depth isn't fixed.
+    """
+    level = 1
+    frame: Optional[FrameType] = sys._getframe(1)  # pylint: disable=protected-access
+    while frame is not None and os.path.dirname(frame.f_code.co_filename) == _PACKAGE_DIR:
+        frame = frame.f_back
+        level += 1
+    return level
+
+
+def encode_utc_datetime(value: datetime) -> bytes:
+    # A tzinfo whose utcoffset returns None still leaves the datetime naive.
+    if value.utcoffset() is None:
+        warnings.warn(MissingTimezoneWarning(), None, _external_stacklevel())
+        delta = value - _NAIVE_EPOCH
+    else:
+        delta = value - _EPOCH
+    return _PACK_I64(delta // _ONE_MILLISECOND)
 
 
 def encode_utc_datetime_element(name: Key, value: datetime) -> bytes:
-    if value.tzinfo is None:
-        warnings.warn(MissingTimezoneWarning(), None, 4)
-    bvalue = int(round(calendar.timegm(value.utctimetuple()) * 1000 +
-                      (value.microsecond / 1000.0)))
-    return b"\x09" + encode_cstring(name) + struct.pack("<q", bvalue)
+    return b"\x09" + encode_cstring(name) + encode_utc_datetime(value)
 
 
 def encode_none_element(name: Key) -> bytes:
@@ -384,16 +800,15 @@ def encode_none_element(name: Key) -> bytes:
 
 
 def encode_int32_element(name: Key, value: int) -> bytes:
-    bvalue = struct.pack("<i", value)
-    return b"\x10" + encode_cstring(name) + bvalue
+    return b"\x10" + encode_cstring(name) + _PACK_I32(value)
 
 
 def encode_uint64_element(name: Key, value: int) -> bytes:
-    return b"\x11" + encode_cstring(name) + struct.pack("<Q", value)
+    return b"\x11" + encode_cstring(name) + _PACK_U64(value)
 
 
 def encode_int64_element(name: Key, value: int) -> bytes:
-    return b"\x12" + encode_cstring(name) + struct.pack("<q", value)
+    return b"\x12" + encode_cstring(name) + _PACK_I64(value)
 
 
 def encode_object_id_element(name: Key, value: bytes) -> bytes:
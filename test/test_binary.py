@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 from unittest import TestCase
+from uuid import UUID
 
 from zaber_bson import dumps, loads
 
@@ -56,3 +57,20 @@ class TestBinary(TestCase):
     def test_utf8_binary(self):
         self.doc[u"\N{SNOWMAN}"] = u"\N{SNOWMAN WITHOUT SNOW}"
         self.test_binary()
+
+    def test_zero_copy(self):
+        self.doc[u"nested"] = {u"uuid": UUID(int=7), u"blob": b"\x00\x01"}
+        dump = dumps(self.doc)
+        decoded = loads(dump, zero_copy=True)
+        self.assertIsInstance(decoded[u"lyrics"][0], memoryview)
+        self.assertIsInstance(decoded[u"nested"][u"blob"], memoryview)
+        self.assertEqual(decoded[u"nested"][u"uuid"], UUID(int=7))
+        self.assertEqual([bytes(line) for line in decoded[u"lyrics"]], self.doc[u"lyrics"])
+        self.assertEqual(bytes(decoded[u"nested"][u"blob"]), b"\x00\x01")
+        self.assertTrue(decoded[u"nested"][u"blob"].readonly)
+
+    def test_zero_copy_bytearray(self):
+        data = bytearray(dumps({u"blob": b"\x00\x01"}))
+        blob = loads(data, zero_copy=True)[u"blob"]
+        self.assertTrue(blob.readonly)
+        self.assertEqual(bytes(blob), b"\x00\x01")
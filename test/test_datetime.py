@@ -1,8 +1,8 @@
 #!/usr/bin/env python
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone, tzinfo
 from unittest import TestCase
 
-from zaber_bson import dumps, loads
+from zaber_bson import dumps, loads, MissingTimezoneWarning
 
 
 class TestDateTime(TestCase):
@@ -16,3 +16,33 @@ class TestDateTime(TestCase):
         seconds_delta = (td.microseconds + (td.seconds + td.days * 24 * 3600) *
                          1e6) / 1e6
         self.assertTrue(abs(seconds_delta) < 0.001)
+
+    def test_offset_timezone(self):
+        when = datetime(2020, 6, 1, 12, 30, 15, 250000,
+                        tzinfo=timezone(timedelta(hours=-7)))
+        obj2 = loads(dumps({"when": when}))
+        self.assertEqual(obj2["when"], when)
+        self.assertEqual(obj2["when"].tzinfo, timezone.utc)
+
+    def test_naive_assumed_utc(self):
+        when = datetime(1960, 6, 1, 12, 30, 15, 250000)
+        with self.assertWarns(MissingTimezoneWarning):
+            serialized = dumps({"when": when})
+        self.assertEqual(loads(serialized)["when"], when.replace(tzinfo=timezone.utc))
+
+    def test_unknown_offset_assumed_utc(self):
+        class Unknown(tzinfo):
+            def utcoffset(self, dt):
+                return None
+
+        when = datetime(2020, 6, 1, 12, 30, 15, 250000, tzinfo=Unknown())
+        with self.assertWarns(MissingTimezoneWarning):
+            serialized = dumps({"when": when})
+        self.assertEqual(loads(serialized)["when"], when.replace(tzinfo=timezone.utc))
+
+    def test_naive_warning_points_at_caller(self):
+        when = datetime(2020, 1, 1)
+        for doc in ({"when": when}, {"nested": {"list": [when]}}):
+            with self.assertWarns(MissingTimezoneWarning) as context:
+                dumps(doc)
+            self.assertEqual(context.filename, __file__)
@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+from unittest import TestCase
+
+from zaber_bson import dumps, loads, loads_lazy
+
+
+class TestDecode(TestCase):
+    def setUp(self):
+        self.doc = {"a": 1, "nested": {"b": [u"c", 2.5]}, b"\x88": None}
+
+    def test_bytearray_input(self):
+        serialized = bytearray(dumps(self.doc))
+        self.assertEqual(loads(serialized), self.doc)
+        self.assertEqual(dict(loads_lazy(serialized)), self.doc)
+
+    def test_invalid_length(self):
+        serialized = dumps(self.doc)
+        for data in (serialized[:-1], b"\xff\xff\xff\xff\x00", b"\x04\x00\x00\x00\x00",
+                     b"\x05\x00\x00", b""):
+            with self.assertRaisesRegex(ValueError, "invalid document length"):
+                loads(data)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+from unittest import TestCase
+
+from zaber_bson import dumps, loads
+
+
+class TestGenerator(TestCase):
+    def test_key_order(self):
+        doc = {"b": 1, "a": [{"d": 2, "c": 3}]}
+        paths = []
+
+        def sorted_keys(obj, stack):
+            paths.append([step.key for step in stack])
+            return iter(sorted(obj.keys()))
+
+        serialized = dumps(doc, generator=sorted_keys)
+        self.assertEqual(paths, [[], ["a", 0]])
+        self.assertLess(serialized.index(b"c\x00"), serialized.index(b"d\x00"))
+        self.assertLess(serialized.index(b"a\x00"), serialized.index(b"b\x00"))
+        self.assertEqual(loads(serialized), doc)
+
+    def test_no_generator_uses_getitem(self):
+        class Defaulted(dict):
+            def __getitem__(self, key):
+                return u"over"
+
+        self.assertEqual(loads(dumps(Defaulted(a=1))), {"a": "over"})
+        self.assertEqual(loads(dumps({"nested": Defaulted(a=1)})), {"nested": {"a": "over"}})
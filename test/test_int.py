@@ -23,3 +23,20 @@ class TestInt(TestCase):
         with self.assertRaises(Exception):
             dump = dumps(self.bad_request_dict)
             decoded = loads(dump)
+
+    def test_int_boundaries(self):
+        doc = {
+            "int32_min": -0x80000000,
+            "int64_below_int32": -0x80000001,
+            "int64_min": -0x8000000000000000,
+            "uint64_max": 0xFFFFFFFFFFFFFFFF,
+        }
+        serialized = dumps(doc)
+        self.assertIn(b"\x10int32_min\x00", serialized)
+        self.assertIn(b"\x12int64_below_int32\x00", serialized)
+        self.assertIn(b"\x12int64_min\x00", serialized)
+        self.assertIn(b"\x11uint64_max\x00", serialized)
+        self.assertEqual(loads(serialized), doc)
+
+        with self.assertRaises(ValueError):
+            dumps({"int64": -0x8000000000000001})
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+from datetime import datetime, timezone
+from unittest import TestCase
+from uuid import UUID
+
+from zaber_bson import dumps, loads, loads_lazy, CLASSNAME_KEY, MissingClassDefinition
+
+
+class TestLazy(TestCase):
+    def setUp(self):
+        self.doc = {
+            "string": "lorem ipsum",
+            "int32": 42,
+            "int64": 0x7FFFFFFFFFFFFFFF,
+            "uint64": 0xFFFFFFFFFFFFFFFF,
+            "double": 2.5,
+            "bool": True,
+            "none": None,
+            "datetime": datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "binary": b"\x00\x01\x02",
+            "uuid": UUID(int=1),
+            "document": {"nested": [1, {"deeper": "value"}]},
+            "array": [1, "two", 3.0],
+            b"\x88": "non utf-8 key",
+        }
+        self.serialized = dumps(self.doc)
+
+    def test_matches_loads(self):
+        lazy = loads_lazy(self.serialized)
+        self.assertEqual(len(lazy), len(self.doc))
+        self.assertEqual(list(lazy), list(self.doc))
+        self.assertEqual(dict(lazy), loads(self.serialized))
+
+    def test_single_field(self):
+        lazy = loads_lazy(self.serialized)
+        self.assertEqual(lazy["document"], self.doc["document"])
+        self.assertIn("int32", lazy)
+        self.assertNotIn("missing", lazy)
+        with self.assertRaises(KeyError):
+            lazy["missing"]
+
+    def test_missing_terminator(self):
+        with self.assertRaises(ValueError):
+            loads_lazy(self.serialized[:-1] + b"\x01")
+
+    def test_invalid_length(self):
+        for data in (self.serialized[:-1], b"\xff\xff\xff\xff\x00", b"\x05\x00\x00"):
+            with self.assertRaises(ValueError):
+                loads_lazy(data)
+
+    def test_contains_does_not_decode(self):
+        serialized = dumps({"unregistered": {CLASSNAME_KEY: "NoSuchClass"}})
+        lazy = loads_lazy(serialized)
+        self.assertIn("unregistered", lazy)
+        with self.assertRaises(MissingClassDefinition):
+            lazy["unregistered"]
@@ -49,3 +49,43 @@ class TestObjectCoding(TestCase):
         serialized = dumps(data2)
         data3 = loads(serialized)
         self.assertTrue(data2 == data3)
+
+    def test_encode_does_not_modify_values(self):
+        class SharedState(TestData):
+            def bson_encode(self):
+                return self.__dict__
+
+        data = SharedState(1, 2)
+        dumps(data)
+        self.assertEqual(data.__dict__, {"args": [1, 2], "nested": None})
+
+    def test_encode_values_getitem_override(self):
+        class Defaulted(dict):
+            def __getitem__(self, key):
+                return u"over"
+
+        class Overridden(TestData):
+            def bson_encode(self):
+                return Defaulted(args=self.args, nested=self.nested)
+
+        import_class(Overridden)
+        for generator in (None, lambda obj, stack: iter(obj.keys())):
+            decoded = loads(dumps(Overridden(1), generator=generator))
+            self.assertEqual(decoded.args, u"over")
+
+    def test_encode_with_generator(self):
+        import_class(TestData)
+        data = TestData(1, u"two")
+        data.nested = TestData(3.0)
+        serialized = dumps(data, generator=lambda obj, stack: iter(obj.keys()))
+        self.assertEqual(serialized, dumps(data))
+        self.assertEqual(loads(serialized), data)
+
+    def test_encode_subclass_class_name(self):
+        class Derived(TestData):
+            pass
+
+        import_class(TestData)
+        import_class(Derived)
+        self.assertIsInstance(loads(dumps(TestData(1))), TestData)
+        self.assertIs(type(loads(dumps(Derived(1)))), Derived)
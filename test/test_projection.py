@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+from unittest import TestCase
+
+from zaber_bson import dumps, loads
+
+
+class TestProjection(TestCase):
+    def setUp(self):
+        self.doc = {
+            "string": "lorem ipsum",
+            "int32": 42,
+            "double": 2.5,
+            "none": None,
+            "binary": b"\x00\x01\x02",
+            "document": {"string": "nested", "int32": 1},
+            "array": [1, "two", 3.0],
+        }
+        self.serialized = dumps(self.doc)
+
+    def test_projection(self):
+        decoded = loads(self.serialized, projection={"int32", "document"})
+        self.assertEqual(decoded, {"int32": 42, "document": {"string": "nested", "int32": 1}})
+
+    def test_skip_everything(self):
+        self.assertEqual(loads(self.serialized, projection=set()), {})
+
+    def test_no_projection(self):
+        self.assertEqual(loads(self.serialized, projection=None), self.doc)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+from collections import OrderedDict
+from enum import IntEnum
+from unittest import TestCase
+
+from zaber_bson import BSONCoding, dumps, loads
+
+
+class Color(IntEnum):
+    RED = 1
+
+
+class Name(str):
+    pass
+
+
+class Coded(int, BSONCoding):
+    def bson_encode(self):
+        return {"value": int(self)}
+
+    def bson_init(self, raw_values):
+        pass
+
+
+class TestSubclass(TestCase):
+    def test_subclasses(self):
+        doc = OrderedDict([("int", Color.RED), ("str", Name("lorem")), ("float", 2.5)])
+        serialized = dumps(doc)
+        self.assertEqual(serialized, dumps({"int": 1, "str": "lorem", "float": 2.5}))
+        self.assertEqual(loads(serialized), {"int": 1, "str": "lorem", "float": 2.5})
+
+    def test_scalar_and_bson_coding(self):
+        serialized = dumps({"value": Coded(7)})
+        self.assertEqual(serialized, dumps({"value": 7}))
+        self.assertEqual(loads(serialized), {"value": 7})
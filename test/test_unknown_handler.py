@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 
-from zaber_bson import dumps, loads
+from zaber_bson import dumps, loads, UnknownSerializerError
 from decimal import Decimal
 from unittest import TestCase
 
@@ -13,3 +13,8 @@ class TestUnknownHandler(TestCase):
         serialized = dumps(obj, on_unknown=float)
         unserialized = loads(serialized)
         self.assertEqual(float(d), unserialized["decimal"])
+
+    def test_unknown_error_names_array_index(self):
+        with self.assertRaises(UnknownSerializerError) as context:
+            dumps({"values": [1, Decimal, 3]})
+        self.assertIn("key ''1''", str(context.exception))
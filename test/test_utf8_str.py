@@ -15,3 +15,13 @@ class TestUtf8Str(TestCase):
         dump = dumps(self.doc)
         decoded = loads(dump)
         self.assertEqual(decoded, self.doc)
+
+    def test_nul_in_name(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                dumps({'a\x00b': 1})
+
+    def test_long_str(self):
+        doc = {'short': '무지개', 'long': '무지개 ' * 20000}
+        decoded = loads(dumps(doc))
+        self.assertEqual(decoded, doc)